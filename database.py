@@ -5,12 +5,13 @@ MongoDB helper functions ready to use in your backend code.
 Import and use these functions in your API endpoints for database operations.
 """
 
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 from datetime import datetime, timezone
 import os
 from dotenv import load_dotenv
-from typing import Union
+from typing import Callable, List, Union
 from pydantic import BaseModel
+from pymongo import UpdateOne
 
 # Load environment variables from .env file
 load_dotenv()
@@ -22,34 +23,88 @@ database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
 
 if database_url and database_name:
-    _client = MongoClient(database_url)
+    # One pooled client per worker process, created at import and reused by
+    # every request. Pool sizes are per worker, so total connections scale
+    # with the worker count; tune them via the environment.
+    _client = AsyncIOMotorClient(
+        database_url,
+        maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", 50)),
+        minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", 0)),
+        waitQueueTimeoutMS=2500,
+        serverSelectionTimeoutMS=3000,
+        retryWrites=True,
+    )
     db = _client[database_name]
 
-# Helper functions for common database operations
-def create_document(collection_name: str, data: Union[BaseModel, dict]):
-    """Insert a single document with timestamp"""
-    if db is None:
-        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
-
+def _to_document(data: Union[BaseModel, dict], now: datetime) -> dict:
+    """Convert a model or dict to a timestamped document"""
     # Convert Pydantic model to dict if needed
     if isinstance(data, BaseModel):
         data_dict = data.model_dump()
     else:
         data_dict = data.copy()
 
-    data_dict['created_at'] = datetime.now(timezone.utc)
-    data_dict['updated_at'] = datetime.now(timezone.utc)
+    data_dict['created_at'] = now
+    data_dict['updated_at'] = now
+    return data_dict
+
+# Helper functions for common database operations
+async def create_document(collection_name: str, data: Union[BaseModel, dict]):
+    """Insert a single document with timestamp"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
 
-    result = db[collection_name].insert_one(data_dict)
+    data_dict = _to_document(data, datetime.now(timezone.utc))
+    result = await db[collection_name].insert_one(data_dict)
     return str(result.inserted_id)
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
+async def insert_documents(collection_name: str, items: List[Union[BaseModel, dict]]):
+    """Insert many documents with timestamps in a single round-trip"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+    if not items:
+        return []
+
+    now = datetime.now(timezone.utc)
+    result = await db[collection_name].insert_many([_to_document(d, now) for d in items], ordered=False)
+    return [str(_id) for _id in result.inserted_ids]
+
+async def upsert_documents(collection_name: str, items: List[Union[BaseModel, dict]], key: Callable[[dict], dict], prune: bool = False):
+    """Upsert many documents matched by key(document) in one unordered bulk write.
+
+    Only the document fields are $set, so re-upserting an unchanged document
+    is a no-op on the server. created_at is written on insert only and means
+    "first seen"; no updated_at is kept. With prune=True, documents matching
+    none of the given keys are then deleted in a separate call, issued only
+    after the upserts succeeded.
+    """
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+    if not items:
+        return
+
+    now = datetime.now(timezone.utc)
+    ops = []
+    keys = []
+    for data in items:
+        data_dict = data.model_dump() if isinstance(data, BaseModel) else data.copy()
+        keys.append(key(data_dict))
+        ops.append(UpdateOne(
+            keys[-1],
+            {"$set": data_dict, "$setOnInsert": {"created_at": now}},
+            upsert=True,
+        ))
+    await db[collection_name].bulk_write(ops, ordered=False)
+    if prune:
+        await db[collection_name].delete_many({"$nor": keys})
+
+async def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None, projection: dict = None, sort: list = None):
     """Get documents from collection"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
     
-    cursor = db[collection_name].find(filter_dict or {})
+    cursor = db[collection_name].find(filter_dict or {}, projection, sort=sort)
     if limit:
         cursor = cursor.limit(limit)
     
-    return list(cursor)
+    return [doc async for doc in cursor]
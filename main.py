@@ -1,17 +1,25 @@
+import asyncio
+import logging
 import os
+import re
+import time
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import feedparser
-import requests
-from fastapi import FastAPI, Query
+import httpx
+import orjson
+from fastapi import FastAPI, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
-from database import db, create_document, get_documents
+from database import db, get_documents, upsert_documents
 from schemas import Article as ArticleSchema, Launch as LaunchSchema
 
-app = FastAPI(title="Grid7 API", version="1.1.0")
+logger = logging.getLogger(__name__)
+
+app = FastAPI(title="Grid7 API", version="1.1.0", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -33,7 +41,32 @@ class LaunchesResponse(BaseModel):
     total: int
 
 
-CATEGORY_SET = {"AI", "OS", "Gadgets", "Other"}
+CATEGORY_SET = frozenset({"AI", "OS", "Gadgets", "Other"})
+
+# Mongo projections returning exactly the public schema fields, so listing
+# documents can be encoded directly without building Pydantic models.
+ARTICLE_PROJECTION = {"_id": 0, **{name: 1 for name in ArticleSchema.model_fields}}
+LAUNCH_PROJECTION = {"_id": 0, **{name: 1 for name in LaunchSchema.model_fields}}
+
+# Serialized /api/articles bodies keyed by (category, limit). Articles only
+# change on RSS refresh, so a short TTL spares the DB round-trip and encoding.
+_ARTICLES_CACHE_TTL = 30.0
+_ARTICLES_CACHE: Dict[Tuple[Optional[str], int], Tuple[float, bytes]] = {}
+# Bumped on every refresh; a request only stores its body if no refresh ran
+# while it was building it, so a pre-refresh page is never cached again.
+_ARTICLES_CACHE_GEN = 0
+
+# Encoded /test success body (it embeds the collection names), rebuilt at
+# most once a minute; the per-request liveness check is a ping.
+_TEST_OK_TTL = 60.0
+_TEST_OK_BODY: Tuple[float, bytes] = (float("-inf"), b"")
+
+# The / body never changes, so it is encoded once
+_ROOT_BODY = orjson.dumps({"name": "Grid7 API", "status": "ok"})
+
+# Set once the startup hook has seeded the demo collections; request handlers
+# never re-check the database for seed data.
+_SEEDED = False
 
 # --- Live Tech RSS Sources (no API keys needed) ---
 TECH_FEEDS = [
@@ -43,10 +76,19 @@ TECH_FEEDS = [
     ("Engadget", "https://www.engadget.com/rss.xml"),
 ]
 
+# Sort placeholder for undated articles
+_EPOCH = datetime.min.replace(tzinfo=timezone.utc)
+
+# Per-feed (ETag, Last-Modified, parsed articles) from the last successful
+# fetch, used for conditional GETs
+_FEED_CACHE: Dict[str, Tuple[Optional[str], Optional[str], List[ArticleSchema]]] = {}
+
 KEYWORD_TO_CATEGORY = {
     "ai": "AI",
     "artificial intelligence": "AI",
     "machine learning": "AI",
+    "openai": "AI",
+    "genai": "AI",
     "linux": "OS",
     "windows": "OS",
     "android": "OS",
@@ -55,58 +97,103 @@ KEYWORD_TO_CATEGORY = {
     "iphone": "Gadgets",
     "ipad": "Gadgets",
     "watch": "Gadgets",
+    "smartwatch": "Gadgets",
     "laptop": "Gadgets",
     "phone": "Gadgets",
+    "smartphone": "Gadgets",
+    "headphone": "Gadgets",
     "camera": "Gadgets",
 }
 
 
+# All keywords as one whole-word alternation (plurals allowed), so the text is
+# scanned once. When several keywords occur, KEYWORD_TO_CATEGORY order still
+# decides.
+_KEYWORD_RE = re.compile(r"\b(" + "|".join(map(re.escape, KEYWORD_TO_CATEGORY)) + r")(?:e?s)?\b")
+_KEYWORD_RANK = {kw: rank for rank, kw in enumerate(KEYWORD_TO_CATEGORY)}
+
+# Any HTML tag in a feed summary
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
 def _infer_category(text: str) -> str:
-    t = (text or "").lower()
-    for kw, cat in KEYWORD_TO_CATEGORY.items():
-        if kw in t:
-            return cat
-    return "Other"
+    found = _KEYWORD_RE.findall((text or "").lower())
+    if not found:
+        return "Other"
+    return KEYWORD_TO_CATEGORY[min(found, key=_KEYWORD_RANK.__getitem__)]
 
 
-def fetch_live_articles(max_per_feed: int = 15) -> List[ArticleSchema]:
+def _parse_feed(source: str, content: bytes, max_per_feed: int) -> List[ArticleSchema]:
+    feed = feedparser.parse(content)
     items: List[ArticleSchema] = []
-    for source, url in TECH_FEEDS:
-        try:
-            feed = feedparser.parse(url)
-            for entry in feed.entries[:max_per_feed]:
-                title = getattr(entry, "title", "").strip()
-                summary = getattr(entry, "summary", getattr(entry, "description", ""))
-                link = getattr(entry, "link", None)
-                # Published date parsing
-                published = None
-                if getattr(entry, "published_parsed", None):
-                    published = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
-                elif getattr(entry, "updated_parsed", None):
-                    published = datetime(*entry.updated_parsed[:6], tzinfo=timezone.utc)
-                category = _infer_category(f"{title} {summary}")
-                art = ArticleSchema(
-                    source=source,
-                    category=category,
-                    headline=title[:240] if title else "Untitled",
-                    summary=(summary or "").replace("<p>", " ").replace("</p>", " ").strip()[:600],
-                    content=None,
-                    links=[link] if link else None,
-                    published_at=published,
-                )
-                items.append(art)
-        except Exception:
-            continue
-    # Sort by time desc, keep latest 60
-    items.sort(key=lambda a: a.published_at or datetime.now(timezone.utc), reverse=True)
+    for entry in feed.entries[:max_per_feed]:
+        title = getattr(entry, "title", "").strip()
+        summary = getattr(entry, "summary", getattr(entry, "description", ""))
+        link = getattr(entry, "link", None)
+        if link and not link.startswith(("http://", "https://")):
+            link = None
+        # Published date parsing
+        published = None
+        if getattr(entry, "published_parsed", None):
+            published = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
+        elif getattr(entry, "updated_parsed", None):
+            published = datetime(*entry.updated_parsed[:6], tzinfo=timezone.utc)
+        category = _infer_category(f"{title} {summary}")
+        art = ArticleSchema(
+            source=source,
+            category=category,
+            headline=title[:240] if title else "Untitled",
+            summary=_TAG_RE.sub(" ", summary or "").strip()[:600],
+            content=None,
+            links=[link] if link else None,
+            published_at=published,
+        )
+        items.append(art)
+    return items
+
+
+async def _fetch_feed(
+    client: httpx.AsyncClient, source: str, url: str, max_per_feed: int
+) -> List[ArticleSchema]:
+    # Conditional GET: an unchanged feed answers 304 and is not re-parsed
+    cached = _FEED_CACHE.get(url)
+    headers = {}
+    if cached:
+        etag, modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if modified:
+            headers["If-Modified-Since"] = modified
+    resp = await client.get(url, headers=headers)
+    if resp.status_code == 304 and cached:
+        return cached[2][:max_per_feed]
+    resp.raise_for_status()
+    # feedparser is CPU-bound, parse off the event loop
+    items = await asyncio.to_thread(_parse_feed, source, resp.content, max_per_feed)
+    _FEED_CACHE[url] = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"), items)
+    return items
+
+
+async def fetch_live_articles(max_per_feed: int = 15) -> List[ArticleSchema]:
+    # Fetch and parse all feeds concurrently
+    async with httpx.AsyncClient(timeout=5, follow_redirects=True) as client:
+        results = await asyncio.gather(
+            *(_fetch_feed(client, source, url, max_per_feed) for source, url in TECH_FEEDS),
+            return_exceptions=True,
+        )
+    # A feed that failed to fetch or parse is skipped
+    items = [art for result in results if isinstance(result, list) for art in result]
+    # Sort by time desc, keep latest 60; undated items go last, matching the
+    # DB listing where Mongo orders null published_at lowest
+    items.sort(key=lambda a: (a.published_at is not None, a.published_at or _EPOCH), reverse=True)
     return items[:60]
 
 
-def ensure_seed_data():
+async def ensure_seed_data():
     """Seed a minimal set of demo content if collections are empty."""
     try:
         # Seed Launches only; articles will be live-fetched
-        if db and db["launch"].count_documents({}) == 0:
+        if db is not None and await db["launch"].find_one({}, {"_id": 1}) is None:
             base = datetime.now(timezone.utc)
             seed_launches: List[LaunchSchema] = [
                 LaunchSchema(
@@ -138,101 +225,171 @@ def ensure_seed_data():
                     link="https://example.com/orbitallink",
                 ),
             ]
-            for ln in seed_launches:
-                create_document("launch", ln)
+            # Every worker runs this hook, so upsert by title rather than
+            # insert: workers racing on a fresh DB converge on one copy each
+            await upsert_documents("launch", seed_launches, key=_launch_key)
     except Exception:
         pass
 
 
+async def ensure_indexes():
+    """Create the indexes backing the listing filters and sort orders."""
+    try:
+        if db is not None:
+            await db["article"].create_index([("category", 1), ("published_at", -1)])
+            await db["article"].create_index([("published_at", -1)])
+            await db["launch"].create_index([("date", 1)])
+            # Seed launches are upserted by title
+            await db["launch"].create_index([("title", 1)], unique=True)
+            # Refresh upserts articles by their first link, or by source and
+            # headline when they have none
+            await db["article"].create_index([("source", 1), ("headline", 1)])
+            await db["article"].create_index(
+                [("links.0", 1)],
+                unique=True,
+                partialFilterExpression={"links.0": {"$exists": True}},
+            )
+    except Exception:
+        # e.g. existing duplicates block a unique index; lookups then run
+        # unindexed, so make it visible
+        logger.exception("Failed to create MongoDB indexes")
+
+
+def _article_key(doc: dict) -> dict:
+    """Identity of a stored article: its first link, else source and headline."""
+    if doc.get("links"):
+        return {"links.0": doc["links"][0]}
+    return {"source": doc["source"], "headline": doc["headline"]}
+
+
+def _launch_key(doc: dict) -> dict:
+    """Identity of a stored launch: its title."""
+    return {"title": doc["title"]}
+
+
+async def _count_total(collection_name: str, filter_dict: dict, fetched: int, limit: int) -> int:
+    """Total matching documents, avoiding a count query where possible."""
+    if fetched < limit:
+        # The page was not full, so it already holds every match
+        return fetched
+    if not filter_dict:
+        # Reads collection metadata instead of scanning
+        return await db[collection_name].estimated_document_count()
+    return await db[collection_name].count_documents(filter_dict)
+
+
 @app.on_event("startup")
 async def startup_event():
-    ensure_seed_data()
+    global _SEEDED
+    await ensure_indexes()
+    if not _SEEDED:
+        await ensure_seed_data()
+        _SEEDED = True
     # Warm the cache with live articles if DB is configured and empty
     try:
-        if db and db["article"].count_documents({}) == 0:
-            for art in fetch_live_articles():
-                create_document("article", art)
+        if db is not None and await db["article"].find_one({}, {"_id": 1}) is None:
+            await upsert_documents("article", await fetch_live_articles(), key=_article_key)
     except Exception:
         pass
 
 
 @app.get("/")
-def root():
-    return {"name": "Grid7 API", "status": "ok"}
+async def root():
+    return Response(_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/api/articles", response_model=ArticlesResponse)
-def get_articles(
+async def get_articles(
     category: Optional[str] = Query(default=None, description="AI | OS | Gadgets | Other"),
     limit: int = Query(default=40, ge=1, le=200),
 ):
-    ensure_seed_data()
+    if category not in CATEGORY_SET:
+        category = None
+    cache_key = (category, limit)
+    now = time.monotonic()
+    cached = _ARTICLES_CACHE.get(cache_key)
+    if cached and now - cached[0] < _ARTICLES_CACHE_TTL:
+        return Response(cached[1], media_type="application/json")
+    generation = _ARTICLES_CACHE_GEN
 
     # Try DB first
-    items: List[ArticleSchema] = []
+    items: List[dict] = []
     total = 0
     try:
-        filter_dict = {}
-        if category and category in CATEGORY_SET:
-            filter_dict["category"] = category
-        docs = get_documents("article", filter_dict=filter_dict, limit=limit)
-        total = db["article"].count_documents(filter_dict) if db else len(docs)
-        for d in docs:
-            d.pop("_id", None)
-            items.append(ArticleSchema(**d))
+        filter_dict = {"category": category} if category else {}
+        # Documents come from our own collection and were validated before
+        # insert, so they are encoded as-is. Untrusted RSS input is validated
+        # in fetch_live_articles().
+        # Newest first (undated last), served from the (category, published_at) index
+        items = await get_documents(
+            "article",
+            filter_dict=filter_dict,
+            limit=limit,
+            projection=ARTICLE_PROJECTION,
+            sort=[("published_at", -1)],
+        )
+        total = await _count_total("article", filter_dict, len(items), limit)
     except Exception:
-        # If DB isn't available, fall back to live fetch
-        items = fetch_live_articles(max_per_feed=15)
-        if category and category in CATEGORY_SET:
-            items = [a for a in items if a.category == category]
-        total = len(items)
-        items = items[:limit]
+        # If DB isn't available, fall back to live fetch (already newest first)
+        articles = await fetch_live_articles(max_per_feed=15)
+        if category:
+            articles = [a for a in articles if a.category == category]
+        total = len(articles)
+        items = [a.model_dump() for a in articles[:limit]]
 
-    # Sort by newest
-    items.sort(key=lambda a: a.published_at or datetime.now(timezone.utc), reverse=True)
-    return ArticlesResponse(items=items, total=total, refreshed_at=datetime.now(timezone.utc))
+    # Returning the response directly bypasses response_model serialization;
+    # the response models stay on the routes for the OpenAPI schema only.
+    body = orjson.dumps({"items": items, "total": total, "refreshed_at": datetime.now(timezone.utc)})
+    if generation == _ARTICLES_CACHE_GEN:
+        _ARTICLES_CACHE[cache_key] = (now, body)
+    return Response(body, media_type="application/json")
 
 
 @app.get("/api/launches", response_model=LaunchesResponse)
-def get_launches(limit: int = Query(default=30, ge=1, le=200)):
-    ensure_seed_data()
+async def get_launches(limit: int = Query(default=30, ge=1, le=200)):
     items = []
     total = 0
     try:
-        docs = get_documents("launch", limit=limit)
-        total = db["launch"].count_documents({}) if db else len(docs)
-        for d in docs:
-            d.pop("_id", None)
-            items.append(LaunchSchema(**d))
+        # Trusted documents, see get_articles()
+        items = await get_documents("launch", limit=limit, projection=LAUNCH_PROJECTION, sort=[("date", 1)])
+        total = await _count_total("launch", {}, len(items), limit)
     except Exception:
         items = []
         total = 0
 
-    return LaunchesResponse(items=items, total=total)
+    return ORJSONResponse({"items": items, "total": total})
 
 
 @app.post("/api/refresh")
-def trigger_refresh():
+async def trigger_refresh():
     """
     Refresh endpoint: fetches fresh articles from RSS feeds and stores them if DB is available.
     Always returns the current timestamp; frontend can show spinner while it reloads.
     """
+    global _ARTICLES_CACHE_GEN
     refreshed_at = datetime.now(timezone.utc)
     try:
-        live_items = fetch_live_articles()
-        if db:
-            # simple strategy: clear and re-insert recent
-            db["article"].delete_many({})
-            for art in live_items:
-                create_document("article", art)
+        live_items = await fetch_live_articles()
+        if db is not None:
+            # Upsert by link: unchanged articles are not rewritten and the
+            # collection is never empty mid-refresh. Articles no longer in the
+            # feeds are then pruned by a separate delete that runs only after
+            # the upserts succeeded, keeping the latest <= 60.
+            try:
+                await upsert_documents("article", live_items, key=_article_key, prune=True)
+            finally:
+                # Even a partial write (e.g. BulkWriteError) changes the listing
+                _ARTICLES_CACHE_GEN += 1
+                _ARTICLES_CACHE.clear()
     except Exception:
         pass
     return {"status": "ok", "refreshed_at": refreshed_at}
 
 
 @app.get("/test")
-def test_database():
+async def test_database():
     """Test endpoint to check if database is available and accessible"""
+    global _TEST_OK_BODY
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available",
@@ -249,9 +406,15 @@ def test_database():
             response["database_name"] = getattr(db, "name", "✅ Connected")
             response["connection_status"] = "Connected"
             try:
-                collections = db.list_collection_names()
+                await db.command("ping")
+                now = time.monotonic()
+                if now - _TEST_OK_BODY[0] <= _TEST_OK_TTL:
+                    return Response(_TEST_OK_BODY[1], media_type="application/json")
+                collections = await db.list_collection_names()
                 response["collections"] = collections[:10]
                 response["database"] = "✅ Connected & Working"
+                _TEST_OK_BODY = (now, orjson.dumps(response))
+                return Response(_TEST_OK_BODY[1], media_type="application/json")
             except Exception as e:
                 response["database"] = f"⚠️  Connected but Error: {str(e)[:50]}"
         else:
@@ -267,4 +430,8 @@ if __name__ == "__main__":
     import uvicorn
 
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # One process per core; each worker has its own DB pool and caches. The
+    # /api/refresh cache clear only reaches the worker that served it, so other
+    # workers may serve a pre-refresh /api/articles body for up to 30s.
+    workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    uvicorn.run("main:app", host="0.0.0.0", port=port, workers=workers, loop="uvloop", http="httptools")
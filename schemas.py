@@ -5,7 +5,7 @@ Each Pydantic model corresponds to a MongoDB collection whose name is the lowerc
 of the class name. For example: Article -> "article", Launch -> "launch".
 """
 from typing import List, Optional
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field
 from datetime import datetime
 
 class Article(BaseModel):
@@ -18,7 +18,7 @@ class Article(BaseModel):
     headline: str = Field(..., description="Article headline")
     summary: str = Field(..., description="Concise 2-3 sentence brief")
     content: Optional[str] = Field(None, description="Full article text or extended brief")
-    links: Optional[List[HttpUrl]] = Field(default=None, description="Source/grounding links")
+    links: Optional[List[str]] = Field(default=None, description="Source/grounding links")
     published_at: Optional[datetime] = Field(default=None, description="Original publish time")
 
 class Launch(BaseModel):
@@ -30,4 +30,4 @@ class Launch(BaseModel):
     description: str = Field(..., description="Short description of the launch")
     date: datetime = Field(..., description="Planned date/time of launch or milestone")
     tag: str = Field(..., description="Category tag e.g., AI | OS | Gadgets | Other")
-    link: Optional[HttpUrl] = Field(default=None, description="Reference link")
+    link: Optional[str] = Field(default=None, description="Reference link")
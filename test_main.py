@@ -0,0 +1,31 @@
+import pytest
+
+from main import _infer_category
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        # Plurals still match their keyword
+        ("Apple's new iPhones and laptops", "Gadgets"),
+        ("The best phones and cameras of the year", "Gadgets"),
+        ("Smartwatches are getting thinner", "Gadgets"),
+        ("Watches with longer battery life", "Gadgets"),
+        ("Open-source AIs compared", "AI"),
+        # Compound words are listed explicitly, since keywords only match whole words
+        ("Smartphone sales slow down", "Gadgets"),
+        ("Noise-cancelling headphones tested", "Gadgets"),
+        ("Microsoft's OpenAI deal", "AI"),
+        ("GenAI tools for developers", "AI"),
+        # KEYWORD_TO_CATEGORY order decides between several keywords
+        ("New iPhone gets AI features", "AI"),
+        ("Machine learning on Linux", "AI"),
+        ("Windows laptop review", "OS"),
+        # Keywords inside other words do not match
+        ("He said the email was lost", "Other"),
+        ("", "Other"),
+        (None, "Other"),
+    ],
+)
+def test_infer_category(text, expected):
+    assert _infer_category(text) == expected